@@ -28,7 +28,6 @@ from google.cloud import logging as google_cloud_logging
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider, export
 from vertexai import agent_engines
-from vertexai.preview import reasoning_engines
 from app.utils.gcs import create_bucket_if_not_exists
 from app.utils.tracing import CloudTraceLoggingSpanExporter
 from app.utils.typing import Feedback
@@ -37,6 +36,9 @@ from vertexai.preview.reasoning_engines import AdkApp
 
 GOOGLE_CLOUD_PROJECT = os.environ.get("GOOGLE_CLOUD_PROJECT")
 
+DEFAULT_EXTRA_PACKAGES = ["./app", "./orchestrate", "a2a_common-0.1.0-py3-none-any.whl"]
+DEFAULT_DESCRIPTION = "A base ReAct agent built with Google's Agent Development Kit (ADK)"
+
 class AgentEngineApp(AdkApp):
     def set_up(self) -> None:
         """Set up logging and tracing for the agent engine app."""
@@ -85,11 +87,15 @@ def deploy_agent_engine_app(
     location: str,
     agent_name: str | None = None,
     requirements_file: str = "requirements.txt",
-    extra_packages: list[str] = ["./app","./orchestrate","a2a_common-0.1.0-py3-none-any.whl"],
+    extra_packages: list[str] | None = None,
     env_vars: dict[str, str] | None = None,
+    description: str = DEFAULT_DESCRIPTION,
 ) -> agent_engines.AgentEngine:
     """Deploy the agent engine aEngine backing LRO:pp to Vertex AI."""
 
+    if extra_packages is None:
+        extra_packages = list(DEFAULT_EXTRA_PACKAGES)
+
     staging_bucket = f"gs://{project}-agent-engine"
 
     create_bucket_if_not_exists(
@@ -111,10 +117,10 @@ def deploy_agent_engine_app(
     agent_config = {
         "agent_engine": agent_engine,
         "display_name": agent_name,
-        "description": "A base ReAct agent built with Google's Agent Development Kit (ADK)",
+        "description": description,
         "extra_packages": extra_packages,
     }
-    logging.info(f"Agent config: {agent_config}")
+    logging.info("Agent config: %s", agent_config)
     agent_config["requirements"] = requirements
     # Log the complete configuration that will be sent
     logging.info(
@@ -123,15 +129,21 @@ def deploy_agent_engine_app(
     # Create a copy for logging to avoid modifying the original if we decide to remove agent_engine for logging
     log_config = {k: v for k, v in agent_config.items() if k != "agent_engine"}
     log_config["agent_engine_class"] = agent_config["agent_engine"].__class__.__name__
-    logging.info(json.dumps(log_config, indent=2, default=str))
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info(json.dumps(log_config, indent=2, default=str))
 
     try:
         # Check if an agent with this name already exists
-        existing_agents = list(agent_engines.list(filter=f"display_name={agent_name}"))
-        if existing_agents:
+        # The value is quoted so names with spaces (e.g. "Orchestrate Agent") match exactly;
+        # only the first match is needed, so stop paging after it. Unnamed agents are always created.
+        existing_agent = None
+        if agent_name:
+            name_filter = 'display_name="{}"'.format(agent_name.replace('"', '\\"'))
+            existing_agent = next(iter(agent_engines.list(filter=name_filter)), None)
+        if existing_agent is not None:
             # Update the existing agent with new configuration
             logging.info(f"Attempting to updste existing: {agent_name} in project {project}, location {location} ")
-            remote_agent = existing_agents[0].update(**agent_config)
+            remote_agent = existing_agent.update(**agent_config)
             logging.info(f"Agent '{agent_name}' updated successfully.")
         else:
             # Create a new agent if none exists
@@ -155,10 +167,8 @@ def deploy_agent_engine_app(
         logging.error("4. Look for recent FAILED builds. The logs there will contain the specific reason for the build failure (e.g., pip install errors, code compilation issues).")
         raise
     except Exception as e:
-        logging.error(f"An unexpected error occurred during agent deployment for '{agent_name}' in project '{project}', location '{location}': {e}")
+        logging.error(f"An unexpected error occurred during agent deployment for '{agent_name}' in project '{project}', location '{location}': {e}", exc_info=True)
         logging.error(f"Agent configuration that might be relevant (excluding agent_engine object): {json.dumps(log_config, indent=2, default=str)}")
-        import traceback
-        logging.error(traceback.format_exc())
         raise
 
     config = {
@@ -176,11 +186,6 @@ def deploy_agent_engine_app(
 
 
 if __name__ == "__main__":
-    # Setup basic logging for the script execution
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
-    )
     import argparse
 
     parser = argparse.ArgumentParser(description="Deploy agent engine app to Vertex AI")
@@ -207,15 +212,26 @@ if __name__ == "__main__":
     parser.add_argument(
         "--extra-packages",
         nargs="+",
-        default=["./app","./orchestrate","./a2a_common-0.1.0-py3-none-any.whl"],
+        default=DEFAULT_EXTRA_PACKAGES,
         help="Additional packages to include",
     )
     parser.add_argument(
         "--set-env-vars",
         help="Comma-separated list of environment variables in KEY=VALUE format",
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log deployment progress and configuration (warnings and errors only by default)",
+    )
     args = parser.parse_args()
 
+    # Setup basic logging for the script execution
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
+    )
+
     # --- Parse and Set Environment Variables ---
     # Parse environment variables if provided
     env_vars = None
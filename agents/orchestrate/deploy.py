@@ -1,9 +1,4 @@
-from orchestrate import agent
-from vertexai import agent_engines
-from vertexai.preview.reasoning_engines import AdkApp
-
-root_agent = agent.root_agent
-
+import os
 
 display_name = "Orchestrate Agent"
 
@@ -12,13 +7,26 @@ description = """
   tasks to and coordinate their work on helping user to get social 
 """
 
-app = AdkApp(
-    agent=root_agent,
-    enable_tracing=True,
-)
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    # Same .env that orchestrate.agent loads; read before agent_engine_app snapshots the environment.
+    load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
+
+    # Imported here so importing this module does not load the Vertex AI SDK.
+    import google.auth
+    from app.agent_engine_app import deploy_agent_engine_app
 
+    project = os.environ.get("GOOGLE_CLOUD_PROJECT")
+    if not project:
+        _, project = google.auth.default()
+    if not project:
+        raise SystemExit("GOOGLE_CLOUD_PROJECT is not set and no project was found in application default credentials.")
 
-remote_agent = agent_engines.create(
-    agent,
-    requirements="./requirements.txt",
-)
\ No newline at end of file
+    remote_agent = deploy_agent_engine_app(
+        project=project,
+        location=os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1"),
+        agent_name=display_name,
+        requirements_file="./requirements.txt",
+        description=description,
+    )
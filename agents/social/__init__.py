@@ -1 +1,9 @@
-from . import agent
\ No newline at end of file
+import importlib
+
+
+def __getattr__(name):
+  # ADK discovery reads `social.agent`; importing it builds the agents and the
+  # Spanner client, so defer that until something actually asks for it.
+  if name == "agent":
+    return importlib.import_module(f"{__name__}.agent")
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
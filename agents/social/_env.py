@@ -0,0 +1,14 @@
+import os
+from dotenv import load_dotenv
+
+# .env that sits next to the social agent modules.
+DOTENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+
+_LOADED = False
+
+def ensure_env():
+    """Loads the social agent .env file once per process."""
+    global _LOADED
+    if not _LOADED:
+        load_dotenv(dotenv_path=DOTENV_PATH)
+        _LOADED = True
@@ -2,12 +2,12 @@ from common.server import A2AServer
 from common.types import AgentCard, AgentCapabilities, AgentSkill
 from common.task_manager import AgentTaskManager
 from social.social_agent import SocialAgent
+from social._env import ensure_env
 
 import os
 import logging
-from dotenv import load_dotenv
 
-load_dotenv()
+ensure_env()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,33 +16,33 @@ host=os.environ.get("A2A_HOST", "localhost")
 port=int(os.environ.get("A2A_PORT",10001))
 PUBLIC_URL=os.environ.get("PUBLIC_URL")
 
-def main():
-    try:
-        capabilities = AgentCapabilities(streaming=True)
-        skill = AgentSkill(
-            id="social_profile_analysis",
-            name="Analyze Instavibe social profile",
-            description="""
+_DESCRIPTION = """
             Using a provided list of names, this agent synthesizes Instavibe social profile information by analyzing posts, friends, and events.
             It delivers a comprehensive single-paragraph summary for individuals, and for groups, identifies commonalities in their social activities
             and connections based on profile data.
-            """,
-            tags=["instavibe"],
-            examples=["Can you tell me about Bob and Alice?"],
-        )
+            """
+
+# Static parts of the agent card, built once at import time.
+_CAPABILITIES = AgentCapabilities(streaming=True)
+_SKILL = AgentSkill(
+    id="social_profile_analysis",
+    name="Analyze Instavibe social profile",
+    description=_DESCRIPTION,
+    tags=["instavibe"],
+    examples=["Can you tell me about Bob and Alice?"],
+)
+
+def main():
+    try:
         agent_card = AgentCard(
             name="Social Profile Agent",
-            description="""
-            Using a provided list of names, this agent synthesizes Instavibe social profile information by analyzing posts, friends, and events.
-            It delivers a comprehensive single-paragraph summary for individuals, and for groups, identifies commonalities in their social activities
-            and connections based on profile data.
-            """,
+            description=_DESCRIPTION,
             url=f"{PUBLIC_URL}",
             version="1.0.0",
             defaultInputModes=SocialAgent.SUPPORTED_CONTENT_TYPES,
             defaultOutputModes=SocialAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
+            capabilities=_CAPABILITIES,
+            skills=[_SKILL],
         )
         server = A2AServer(
             agent_card=agent_card,
@@ -52,7 +52,7 @@ def main():
         )
         server.start()
     except Exception as e:
-        logger.error(f"An error occurred during server startup: {e}")
+        logger.error("An error occurred during server startup: %s", e)
         exit(1)
 
 if __name__ == "__main__":
@@ -1,7 +1,14 @@
+import asyncio
 import datetime
+import functools
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from zoneinfo import ZoneInfo
+from cachetools import TTLCache
 from google.adk.agents import LoopAgent, LlmAgent, BaseAgent
-from social.instavibe import get_person_posts,get_person_friends,get_person_id_by_name,get_person_attended_events
+from social.instavibe import get_person_posts,get_person_friends,get_person_id_by_name,get_person_attended_events,get_person_profiles,prefetch_profiles,record_profiles_found
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event, EventActions
 from typing import AsyncGenerator
@@ -14,32 +21,140 @@ from typing import Optional
 # Get a logger instance
 log = logging.getLogger(__name__)
 
-class CheckCondition(BaseAgent):
-    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
-        #log.info(f"Checking status: {ctx.session.state.get("summary_status", "fail")}")
-        log.info(f"Summary: {ctx.session.state.get("summary")}")
+# The summary is a short, bounded paragraph, so it runs on a lighter model than tool calling.
+PROFILE_MODEL = os.environ.get("SOCIAL_PROFILE_MODEL", "gemini-2.0-flash")
+SUMMARY_MODEL = os.environ.get("SOCIAL_SUMMARY_MODEL", "gemini-2.0-flash-lite")
+
+def _offload(func):
+    """Wraps a blocking Spanner fetcher so it runs in a worker thread instead of the event loop."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+# Summary attempts per request; a pending summary is retried once, then accepted if non-empty.
+MAX_SUMMARY_ATTEMPTS = 2
+
+# Summaries starting with these are treated as a failed generation.
+_FAILED_SUMMARY_PREFIXES = ("error", "sorry", "i cannot")
+
+def summary_status(summary) -> str:
+    """Returns 'completed' if the summary looks like a real paragraph, else 'pending'."""
+    if not isinstance(summary, str):
+        return "pending"
+    text = summary.strip()
+    if (len(text) >= 40
+            and any(c.isalpha() for c in text)
+            and not text.lower().startswith(_FAILED_SUMMARY_PREFIXES)):
+        return "completed"
+    return "pending"
+
+# Capitalized words in the request; each word and each adjacent pair is a name guess.
+_NAME_RE = re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b")
+# Capitalized only because they start a sentence; never worth a Spanner query.
+_NOT_NAMES = frozenset({
+    "A", "About", "An", "And", "Are", "Can", "Could", "Compare", "Describe", "Did", "Do",
+    "Does", "Find", "Give", "Hello", "Hi", "How", "I", "Is", "Please", "Show", "Summarize",
+    "Tell", "The", "Their", "Them", "Then", "These", "They", "This", "What", "When",
+    "Where", "Which", "Who", "Why", "Would",
+})
+
+def _extract_names(text: str) -> list[str]:
+    """Guesses person names in `text` from runs of capitalized words."""
+    names = []
+    for match in _NAME_RE.finditer(text or ""):
+        words = match.group().split()
+        while words and words[0] in _NOT_NAMES:
+            words = words[1:]
+        names += words + [" ".join(pair) for pair in zip(words, words[1:])]
+    return list(dict.fromkeys(names))
+
+# Invocations whose prefetch has started; the loop re-enters profile_agent on every iteration.
+_prefetched_invocations = TTLCache(maxsize=1_000, ttl=600)
+_prefetched_lock = threading.Lock()
+# Prefetches are best effort; a small pool bounds the threads and Spanner sessions they hold.
+_prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="social-prefetch")
+
+def _log_prefetch_failure(future) -> None:
+    if future.exception() is not None:
+        log.warning("Profile prefetch failed: %s", future.exception())
+
+def prefetch_profiles_callback(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Starts warming the Spanner caches for names guessed from the request while the LLM plans."""
+    with _prefetched_lock:
+        if callback_context.invocation_id in _prefetched_invocations:
+            return None
+        _prefetched_invocations[callback_context.invocation_id] = True
+    content = callback_context.user_content
+    text = " ".join(p.text for p in (content.parts or []) if p.text) if content else ""
+    names = _extract_names(text)
+    if names:
+        log.debug("Prefetching profiles for %s", names)
+        _prefetch_pool.submit(prefetch_profiles, names).add_done_callback(_log_prefetch_failure)
+    return None
+
+NO_PROFILES_SUMMARY = "No profile information could be retrieved for the requested person(s)."
+
+def skip_summary_without_profiles(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Answers with a fixed summary instead of calling the model when no requested person was found."""
+    # The profile tools add to [invocation_id, count]; a value left by an earlier request is ignored.
+    found = callback_context.state.get("profiles_found")
+    if not found or tuple(found) != (callback_context.invocation_id, 0):
+        return None
+    log.info("No profiles were found, skipping the summary model call.")
+    callback_context.state["summary"] = NO_PROFILES_SUMMARY
+    return types.Content(role="model", parts=[types.Part(text=NO_PROFILES_SUMMARY)])
 
-        status = ctx.session.state.get("summary_status", "fail").strip()
-        is_done = (status == "completed")
+def count_individual_lookups(tool, args, tool_context, tool_response) -> Optional[dict]:
+    """Counts data returned by the individual lookup tools so the summary step is not skipped."""
+    if tool.name != get_person_profiles.__name__ and tool_response:
+        record_profiles_found(tool_context, 1)
+    return None
 
-        yield Event(author=self.name, actions=EventActions(escalate=is_done))
+class CheckCondition(BaseAgent):
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        summary = ctx.session.state.get("summary")
+        log.info("Summary: %s", summary)
+
+        # Attempts are stored as [invocation_id, count] so each request starts from zero.
+        attempts = ctx.session.state.get("summary_attempts")
+        attempt = attempts[1] + 1 if attempts and attempts[0] == ctx.invocation_id else 1
+
+        status = summary_status(summary)
+        if status == "pending" and attempt >= MAX_SUMMARY_ATTEMPTS and isinstance(summary, str) and summary.strip():
+            # A short or apologetic summary is still an answer; don't rerun the whole pipeline for it.
+            status = "completed"
+        is_done = (status == "completed") or attempt >= MAX_SUMMARY_ATTEMPTS
+
+        yield Event(
+            author=self.name,
+            actions=EventActions(
+                state_delta={"summary_status": status, "summary_attempts": [ctx.invocation_id, attempt]},
+                escalate=is_done,
+            ),
+        )
 
 profile_agent = LlmAgent(
     name="profile_agent",
-    model="gemini-2.0-flash",
+    model=PROFILE_MODEL,
     description=(
         "Agent to answer questions about the this person's social profile. User will ask person's profile using their name, make sure to fetch the id before getting other data."
     ),
     instruction=(
-        "You are a helpful agent who can answer user questions about this person's social profile."
+        "You are a helpful agent who can answer user questions about this person's social profile. "
+        "To gather profiles, call get_person_profiles once with every name mentioned in the request; "
+        "it returns posts, friends and attended events for all of them in one call. "
+        "Only use the individual lookup tools for narrow follow-up questions."
     ),
-    tools=[get_person_posts,get_person_friends,get_person_id_by_name,get_person_attended_events],
+    before_agent_callback=prefetch_profiles_callback,
+    after_tool_callback=count_individual_lookups,
+    tools=[get_person_profiles] + [_offload(f) for f in (get_person_posts,get_person_friends,get_person_id_by_name,get_person_attended_events)],
 )
 
 
 summary_agent = LlmAgent(
     name="summary_agent",
-    model="gemini-2.0-flash",
+    model=SUMMARY_MODEL,
     description=(
         "Generate a comprehensive social summary as a single, cohesive paragraph. This summary should cover the activities, posts, friend networks, and event participation of one or more individuals. If multiple profiles are analyzed, the paragraph must also identify and integrate any common ground found between them."
     ),
@@ -47,6 +162,10 @@ summary_agent = LlmAgent(
         """
         Your primary task is to synthesize social profile information into a single, comprehensive paragraph.
 
+            **Input Format:**
+            *   Profiles arrive as compact text, one block per person: a "name|id=..." line followed by indented "posts:", "friends:" and "events:" lines.
+            *   Posts are listed as "text (sentiment, date)" and events as "name@date", separated by "; ". "none" means the list is empty and "unavailable" means it could not be fetched.
+
             **Input Scope & Default Behavior:**
             *   If specific individuals are named by the user, focus your analysis on them.
             *   **If no individuals are specified, or if the request is general, assume the user wants an analysis of *all relevant profiles available in the current dataset/context*.**
@@ -76,16 +195,8 @@ summary_agent = LlmAgent(
             *   If data for a specific category (posts, friends, events) is missing or sparse for a profile, you may briefly acknowledge this within the narrative if relevant.
                 """
         ),
-    output_key="summary"
-)
-
-check_agent = LlmAgent(
-    name="check_agent",
-    model="gemini-2.0-flash",
-    description=(
-        "Check if everyone's social profile are summarized and has been generated. Output 'completed' or 'pending'."
-    ),
-    output_key="summary_status"
+    output_key="summary",
+    before_agent_callback=skip_summary_without_profiles,
 )
 
 def modify_output_after_agent(callback_context: CallbackContext) -> Optional[types.Content]:
@@ -94,18 +205,18 @@ def modify_output_after_agent(callback_context: CallbackContext) -> Optional[typ
     invocation_id = callback_context.invocation_id
     current_state = callback_context.state.to_dict()
     current_user_content = callback_context.user_content
-    print(f"[Callback] Exiting agent: {agent_name} (Inv: {invocation_id})")
-    print(f"[Callback] Current summary_status: {current_state.get("summary_status")}")
-    print(f"[Callback] Current Content: {current_user_content}")
+    log.debug("[Callback] Exiting agent: %s (Inv: %s)", agent_name, invocation_id)
+    log.debug("[Callback] Current summary_status: %s", current_state.get("summary_status"))
+    log.debug("[Callback] Current Content: %s", current_user_content)
 
-    status = current_state.get("summary_status").strip()
+    status = current_state.get("summary_status", "pending").strip()
     is_done = (status == "completed")
     # Retrieve the final summary from the state
 
     final_summary = current_state.get("summary")
-    print(f"[Callback] final_summary: {final_summary}")
+    log.debug("[Callback] final_summary: %s", final_summary)
     if final_summary and is_done and isinstance(final_summary, str):
-        log.info(f"[Callback] Found final summary, constructing output Content.")
+        log.info("[Callback] Found final summary, constructing output Content.")
         # Construct the final output Content object to be sent back
         return types.Content(role="model", parts=[types.Part(text=final_summary.strip())])
     else:
@@ -118,7 +229,6 @@ root_agent = LoopAgent(
     sub_agents=[
         profile_agent,
         summary_agent,
-        check_agent,
         CheckCondition(name="Checker")
     ],
     description="Find everyone's social profile on events, post and friends",
@@ -1,23 +1,35 @@
 # spanner_data_fetchers.py
 
+import asyncio
+import functools
+import inspect
+import logging
 import os
-from dotenv import load_dotenv
-import traceback
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
 import json # For example usage printing
 
 from google.cloud import spanner
 from google.cloud.spanner_v1 import param_types
 from google.api_core import exceptions
+from cachetools import TTLCache
+from social._env import ensure_env
 
-load_dotenv()
+if TYPE_CHECKING:
+    from google.adk.tools import ToolContext
+
+log = logging.getLogger(__name__)
+
+ensure_env()
 # --- Spanner Configuration ---
 INSTANCE_ID = os.environ.get("SPANNER_INSTANCE_ID", "instavibe-graph-instance")
 DATABASE_ID = os.environ.get("SPANNER_DATABASE_ID", "graphdb")
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
 
 if not PROJECT_ID:
-    print("Warning: GOOGLE_CLOUD_PROJECT environment variable not set.")
+    log.warning("GOOGLE_CLOUD_PROJECT environment variable not set.")
 
 # --- Spanner Client Initialization ---
 db_instance = None
@@ -27,22 +39,22 @@ try:
         spanner_client = spanner.Client(project=PROJECT_ID)
         instance = spanner_client.instance(INSTANCE_ID)
         database = instance.database(DATABASE_ID)
-        print(f"Attempting to connect to Spanner: {instance.name}/databases/{database.name}")
+        log.info("Attempting to connect to Spanner: %s/databases/%s", instance.name, database.name)
 
         if not database.exists():
-             print(f"Error: Database '{database.name}' does not exist in instance '{instance.name}'.")
+             log.error("Database '%s' does not exist in instance '%s'.", database.name, instance.name)
              db_instance = None
         else:
-            print("Spanner database connection check successful.")
+            log.info("Spanner database connection check successful.")
             db_instance = database
     else:
-        print("Skipping Spanner client initialization due to missing GOOGLE_CLOUD_PROJECT.")
+        log.warning("Skipping Spanner client initialization due to missing GOOGLE_CLOUD_PROJECT.")
 
 except exceptions.NotFound:
-    print(f"Error: Spanner instance '{INSTANCE_ID}' not found in project '{PROJECT_ID}'.")
+    log.error("Spanner instance '%s' not found in project '%s'.", INSTANCE_ID, PROJECT_ID)
     db_instance = None
 except Exception as e:
-    print(f"An unexpected error occurred during Spanner initialization: {e}")
+    log.exception("An unexpected error occurred during Spanner initialization: %s", e)
     db_instance = None
 
 def run_sql_query(sql, params=None, param_types=None, expected_fields=None):
@@ -51,12 +63,11 @@ def run_sql_query(sql, params=None, param_types=None, expected_fields=None):
     Returns: list[dict] or None on error.
     """
     if not db_instance:
-        print("Error: Database connection is not available.")
+        log.error("Database connection is not available.")
         return None
 
     results_list = []
-    print(f"--- Executing SQL Query ---")
-    # print(f"SQL: {sql}")
+    log.debug("Executing SQL query: %s", sql)
 
     try:
         with db_instance.snapshot() as snapshot:
@@ -68,21 +79,20 @@ def run_sql_query(sql, params=None, param_types=None, expected_fields=None):
 
             field_names = expected_fields
             if not field_names:
-                 print("Error: expected_fields must be provided to run_sql_query.")
+                 log.error("expected_fields must be provided to run_sql_query.")
                  return None
 
             for row in results:
                 if len(field_names) != len(row):
-                     print(f"Warning: Mismatch between field names ({len(field_names)}) and row values ({len(row)}). Skipping row: {row}")
+                     log.warning("Mismatch between field names (%d) and row values (%d). Skipping row: %s", len(field_names), len(row), row)
                      continue
                 results_list.append(dict(zip(field_names, row)))
 
     except (exceptions.NotFound, exceptions.PermissionDenied, exceptions.InvalidArgument) as spanner_err:
-        print(f"Spanner SQL Query Error ({type(spanner_err).__name__}): {spanner_err}")
+        log.error("Spanner SQL Query Error (%s): %s", type(spanner_err).__name__, spanner_err)
         return None
     except Exception as e:
-        print(f"An unexpected error occurred during SQL query execution or processing: {e}")
-        traceback.print_exc()
+        log.exception("An unexpected error occurred during SQL query execution or processing: %s", e)
         return None
 
     return results_list
@@ -94,12 +104,11 @@ def run_graph_query( graph_sql, params=None, param_types=None, expected_fields=N
     Returns: list[dict] or None on error.
     """
     if not db_instance:
-        print("Error: Database connection is not available.")
+        log.error("Database connection is not available.")
         return None
 
     results_list = []
-    print(f"--- Executing Graph Query ---")
-    # print(f"GQL: {graph_sql}") # Uncomment for verbose query logging
+    log.debug("Executing graph query: %s", graph_sql)
 
     try:
         with db_instance.snapshot() as snapshot:
@@ -111,25 +120,105 @@ def run_graph_query( graph_sql, params=None, param_types=None, expected_fields=N
 
             field_names = expected_fields
             if not field_names:
-                 print("Error: expected_fields must be provided to run_graph_query.")
+                 log.error("expected_fields must be provided to run_graph_query.")
                  return None
 
             for row in results:
                 if len(field_names) != len(row):
-                     print(f"Warning: Mismatch between field names ({len(field_names)}) and row values ({len(row)}). Skipping row: {row}")
+                     log.warning("Mismatch between field names (%d) and row values (%d). Skipping row: %s", len(field_names), len(row), row)
                      continue
                 results_list.append(dict(zip(field_names, row)))
 
     except (exceptions.NotFound, exceptions.PermissionDenied, exceptions.InvalidArgument) as spanner_err:
-        print(f"Spanner Graph Query Error ({type(spanner_err).__name__}): {spanner_err}")
+        log.error("Spanner Graph Query Error (%s): %s", type(spanner_err).__name__, spanner_err)
         return None
     except Exception as e:
-        print(f"An unexpected error occurred during graph query execution or processing: {e}")
-        traceback.print_exc()
+        log.exception("An unexpected error occurred during graph query execution or processing: %s", e)
         return None
 
     return results_list
 
+# --- Lookup Caches ---
+# Successful lookups are cached per name / person_id so repeated questions about
+# the same people skip Spanner. IDs rarely change; activity is kept fresher.
+_id_cache = TTLCache(maxsize=10_000, ttl=300)
+_posts_cache = TTLCache(maxsize=5_000, ttl=60)
+_friends_cache = TTLCache(maxsize=5_000, ttl=60)
+_events_cache = TTLCache(maxsize=5_000, ttl=60)
+# Prefetch guesses that matched nobody, so words like "Tell" are not looked up on every request.
+# Only prefetching consults this; real tool calls always query unknown names.
+_unknown_guesses = TTLCache(maxsize=10_000, ttl=300)
+_cache_lock = threading.Lock()
+_cache_counters = {}
+# Lookups currently running, keyed by (fetcher name, key). Concurrent callers wait on
+# the running query's future instead of issuing the same query again.
+_in_flight: dict[tuple, Future] = {}
+
+def _lookup(name, cache, keys, fetch_many, missing=None):
+    """
+    Serves `keys` from `cache`, waits on lookups already in flight and fetches the rest
+    with one call to `fetch_many`.
+
+    `fetch_many(keys)` must return a dict mapping each key to its result, or None on
+    error. Keys absent from that dict resolve to `missing`. Only non-None results are
+    cached, so errors and unknown names are retried on the next call.
+    """
+    counters = _cache_counters[name]
+    found, waiting, owned = {}, {}, {}
+    with _cache_lock:
+        for key in dict.fromkeys(keys):
+            result = cache.get((key,))
+            if result is not None:
+                found[key] = result
+            elif (name, key) in _in_flight:
+                waiting[key] = _in_flight[(name, key)]
+            else:
+                owned[key] = _in_flight[(name, key)] = Future()
+        counters["hits"] += len(found) + len(waiting)
+        counters["misses"] += len(owned)
+
+    # Resolve our own keys before waiting on anyone else's, so callers never wait in a cycle.
+    if owned:
+        fetched = None
+        try:
+            fetched = fetch_many(list(owned))
+        finally:
+            with _cache_lock:
+                for key, future in owned.items():
+                    result = None if fetched is None else fetched.get(key, missing)
+                    if result is not None:
+                        cache[(key,)] = found[key] = result
+                    del _in_flight[(name, key)]
+                    future.set_result(result)
+
+    for key, future in waiting.items():
+        result = future.result()
+        if result is not None:
+            found[key] = result
+    return found
+
+def _cached(cache):
+    """Caches non-None results of a single-key fetcher in `cache`, keyed by its argument."""
+    def decorator(func):
+        signature = inspect.signature(func)
+        _cache_counters.setdefault(func.__name__, {"hits": 0, "misses": 0, "cache": cache})
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            (key,) = signature.bind(*args, **kwargs).arguments.values()
+            return _lookup(func.__name__, cache, [key], lambda keys: {key: func(key)}).get(key)
+        return wrapper
+    return decorator
+
+def _cache_stats() -> dict:
+    """Returns hit/miss counts and current size of each lookup cache."""
+    with _cache_lock:
+        return {
+            name: {"hits": c["hits"], "misses": c["misses"], "size": len(c["cache"])}
+            for name, c in _cache_counters.items()
+        }
+
+@_cached(_events_cache)
 def get_person_attended_events(person_id: str)-> list[dict]:
     """
     Fetches events attended by a specific person using Graph Query.
@@ -161,6 +250,7 @@ def get_person_attended_events(person_id: str)-> list[dict]:
             event['attendance_time'] = event['attendance_time'].isoformat()
     return results
 
+@_cached(_id_cache)
 def get_person_id_by_name( name: str) -> str:
     """
     Fetches the person_id for a given name using SQL.
@@ -193,6 +283,7 @@ def get_person_id_by_name( name: str) -> str:
         return None # Name not found
 
 
+@_cached(_posts_cache)
 def get_person_posts( person_id: str)-> list[dict]:
     """
     Fetches posts written by a specific person using Graph Query.
@@ -238,6 +329,7 @@ def get_person_posts( person_id: str)-> list[dict]:
     return results
 
 
+@_cached(_friends_cache)
 def get_person_friends( person_id: str)-> list[dict]:
     """
     Fetches friends for a specific person using Graph Query.
@@ -259,4 +351,268 @@ def get_person_friends( person_id: str)-> list[dict]:
 
     results = run_graph_query( graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
 
-    return results
\ No newline at end of file
+    return results
+
+
+def _batched(func, cache, person_ids, fetch_many):
+    """
+    Serves per-person results from `cache` and fetches all misses with one batched query.
+
+    `fetch_many(missing_ids)` must return a dict mapping person_id to its result, or None
+    on error. Results are stored in the same cache the single-person fetcher `func` uses,
+    and lookups already running for either of them are shared.
+    """
+    return _lookup(func.__name__, cache, person_ids, fetch_many, missing=[])
+
+
+def _group_by_owner(results):
+    """Groups rows carrying an `owner_id` field into lists keyed by that ID."""
+    grouped = {}
+    for row in results:
+        grouped.setdefault(row.pop("owner_id"), []).append(row)
+    return grouped
+
+
+def get_people_ids_by_names(names: list[str]) -> dict[str, str]:
+    """
+    Fetches the person_id for several names with a single SQL query.
+
+    Args:
+       names (list[str]): The names of the people to search for.
+
+    Returns:
+        dict[str, str]: Maps each name that was found to its person_id (the first match
+                        if names are duplicated). Unknown names are left out.
+    """
+    def fetch_many(missing):
+        sql = """
+            SELECT name, person_id
+            FROM Person
+            WHERE name IN UNNEST(@names)
+        """
+        params = {"names": missing}
+        param_types_map = {"names": param_types.Array(param_types.STRING)}
+        fields = ["name", "person_id"]
+
+        results = run_sql_query(sql, params=params, param_types=param_types_map, expected_fields=fields)
+        if results is None:
+            return None
+
+        ids = {}
+        for row in results:
+            ids.setdefault(row["name"], row["person_id"])
+        return ids
+
+    return _lookup("get_person_id_by_name", _id_cache, names, fetch_many)
+
+
+def get_posts_for_people(person_ids: list[str]) -> dict[str, list]:
+    """
+    Fetches posts for several people with a single Graph Query.
+
+    Args:
+        person_ids (list[str]): The IDs of the people whose posts to fetch.
+
+    Returns:
+        dict[str, list]: Maps each person_id to its list of post dictionaries with ISO date
+                         strings. IDs whose lookup failed are left out.
+    """
+    def fetch_many(ids):
+        graph_sql = """
+            Graph SocialGraph
+            MATCH (author:Person)-[w:Wrote]->(post:Post)
+            WHERE author.person_id IN UNNEST(@person_ids)
+            RETURN author.person_id AS owner_id, post.post_id, post.author_id, post.text, post.sentiment, post.post_timestamp, author.name AS author_name
+            ORDER BY post.post_timestamp DESC
+        """
+        params = {"person_ids": ids}
+        param_types_map = {"person_ids": param_types.Array(param_types.STRING)}
+        fields = ["owner_id", "post_id", "author_id", "text", "sentiment", "post_timestamp", "author_name"]
+
+        results = run_graph_query(graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
+        if results is None:
+            return None
+
+        for post in results:
+            if isinstance(post.get('post_timestamp'), datetime):
+                post['post_timestamp'] = post['post_timestamp'].isoformat()
+        return _group_by_owner(results)
+
+    if not db_instance: return {}
+    return _batched(get_person_posts, _posts_cache, person_ids, fetch_many)
+
+
+def get_friends_for_people(person_ids: list[str]) -> dict[str, list]:
+    """
+    Fetches friends for several people with a single Graph Query.
+
+    Args:
+        person_ids (list[str]): The IDs of the people whose friends to fetch.
+
+    Returns:
+        dict[str, list]: Maps each person_id to its list of friend dictionaries.
+                         IDs whose lookup failed are left out.
+    """
+    def fetch_many(ids):
+        graph_sql = """
+            Graph SocialGraph
+            MATCH (p:Person)-[f:Friendship]-(friend:Person)
+            WHERE p.person_id IN UNNEST(@person_ids)
+            RETURN DISTINCT p.person_id AS owner_id, friend.person_id, friend.name
+            ORDER BY friend.name
+        """
+        params = {"person_ids": ids}
+        param_types_map = {"person_ids": param_types.Array(param_types.STRING)}
+        fields = ["owner_id", "person_id", "name"]
+
+        results = run_graph_query(graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
+        return None if results is None else _group_by_owner(results)
+
+    if not db_instance: return {}
+    return _batched(get_person_friends, _friends_cache, person_ids, fetch_many)
+
+
+def get_events_for_people(person_ids: list[str]) -> dict[str, list]:
+    """
+    Fetches attended events for several people with a single Graph Query.
+
+    Args:
+        person_ids (list[str]): The IDs of the people whose events to fetch.
+
+    Returns:
+        dict[str, list]: Maps each person_id to its list of event dictionaries with ISO
+                         date strings. IDs whose lookup failed are left out.
+    """
+    def fetch_many(ids):
+        graph_sql = """
+            Graph SocialGraph
+            MATCH (p:Person)-[att:Attended]->(e:Event)
+            WHERE p.person_id IN UNNEST(@person_ids)
+            RETURN p.person_id AS owner_id, e.event_id, e.name, e.event_date, att.attendance_time
+            ORDER BY e.event_date DESC
+        """
+        params = {"person_ids": ids}
+        param_types_map = {"person_ids": param_types.Array(param_types.STRING)}
+        fields = ["owner_id", "event_id", "name", "event_date", "attendance_time"]
+
+        results = run_graph_query(graph_sql, params=params, param_types=param_types_map, expected_fields=fields)
+        if results is None:
+            return None
+
+        for event in results:
+            if isinstance(event.get('event_date'), datetime):
+                event['event_date'] = event['event_date'].isoformat()
+            if isinstance(event.get('attendance_time'), datetime):
+                event['attendance_time'] = event['attendance_time'].isoformat()
+        return _group_by_owner(results)
+
+    if not db_instance: return {}
+    return _batched(get_person_attended_events, _events_cache, person_ids, fetch_many)
+
+
+def prefetch_profiles(names: list[str]) -> None:
+    """Warms the lookup caches for `names` so a later get_person_profiles call is served from memory."""
+    with _cache_lock:
+        names = [n for n in names if (n,) not in _unknown_guesses]
+    if not names:
+        return
+    ids = get_people_ids_by_names(names)
+    with _cache_lock:
+        for name in names:
+            if name not in ids:
+                _unknown_guesses[(name,)] = True
+    person_ids = list(ids.values())
+    if person_ids:
+        get_posts_for_people(person_ids)
+        get_friends_for_people(person_ids)
+        get_events_for_people(person_ids)
+
+
+def _to_compact(profiles: list[dict]) -> str:
+    """
+    Renders profiles as compact text for the LLM instead of nested JSON, e.g.
+
+        Alice|id=a1
+         posts: Loved the hike (positive, 2024-05-01); ...
+         friends: Bob, Carol
+         events: Climbing Meetup@2024-01-12
+    """
+    def items(values, render):
+        if values is None:
+            return "unavailable"
+        return "; ".join(render(v) for v in values) or "none"
+
+    def post(p):
+        text = " ".join(str(p.get("text") or "").split())
+        return f"{text} ({p.get('sentiment')}, {str(p.get('post_timestamp') or '')[:10]})"
+
+    def event(e):
+        return f"{e.get('name')}@{str(e.get('event_date') or '')[:10]}"
+
+    lines = []
+    for profile in profiles:
+        if "error" in profile:
+            lines.append(f"{profile['person_name']}|error={profile['error']}")
+            continue
+        friends = profile["friends"]
+        lines += [
+            f"{profile['person_name']}|id={profile['person_id']}",
+            f" posts: {items(profile['posts'], post)}",
+            f" friends: {'unavailable' if friends is None else ', '.join(f['name'] for f in friends) or 'none'}",
+            f" events: {items(profile['attended_events'], event)}",
+        ]
+    return "\n".join(lines)
+
+
+def record_profiles_found(tool_context: "ToolContext", found: int) -> None:
+    """Adds `found` to the invocation's profile count in state["profiles_found"].
+
+    The value is stored as [invocation_id, count]; a count left by an earlier
+    invocation is replaced rather than added to.
+    """
+    previous = tool_context.state.get("profiles_found")
+    if previous and previous[0] == tool_context.invocation_id:
+        found += previous[1]
+    tool_context.state["profiles_found"] = [tool_context.invocation_id, found]
+
+
+async def get_person_profiles(names: list[str], tool_context: Optional["ToolContext"] = None) -> str:
+    """
+    Fetches the full social profile (posts, friends and attended events) for one or more people by name.
+
+    Args:
+        names (list[str]): The names of the people to look up.
+
+    Returns:
+        str: One block per name. The first line is "name|id=<person_id>" (or
+             "name|error=<reason>" if the person was not found), followed by indented
+             "posts:", "friends:" and "events:" lines. Posts are "text (sentiment, date)"
+             and events are "name@date", separated by "; ".
+    """
+    ids = await asyncio.to_thread(get_people_ids_by_names, names)
+    person_ids = list(ids.values())
+
+    # One batched query per kind of data, run concurrently.
+    posts, friends, events = await asyncio.gather(
+        asyncio.to_thread(get_posts_for_people, person_ids),
+        asyncio.to_thread(get_friends_for_people, person_ids),
+        asyncio.to_thread(get_events_for_people, person_ids),
+    )
+
+    profiles = []
+    for name in names:
+        person_id = ids.get(name)
+        if not person_id:
+            profiles.append({"person_name": name, "error": f"Could not find a person named '{name}'."})
+            continue
+        profiles.append({
+            "person_name": name,
+            "person_id": person_id,
+            "posts": posts.get(person_id),
+            "friends": friends.get(person_id),
+            "attended_events": events.get(person_id),
+        })
+    # Lets the summary step skip its model call when nobody was found in this invocation.
+    if tool_context is not None:
+        record_profiles_found(tool_context, sum("error" not in p for p in profiles))
+    return _to_compact(profiles)
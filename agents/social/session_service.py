@@ -0,0 +1,102 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+
+class BoundedSessionService(InMemorySessionService):
+  """An in-memory session service with bounded growth.
+
+  Keeps at most `max_sessions` sessions, evicting the least recently used one,
+  and caps the number of stored events per session so a long-lived session
+  (the social agent always runs as the same user) cannot grow without limit.
+  """
+
+  def __init__(
+      self,
+      max_sessions: Optional[int] = None,
+      max_events_per_session: Optional[int] = None,
+  ):
+    super().__init__()
+    self.max_sessions = max_sessions or int(
+        os.environ.get("SOCIAL_SESSION_CACHE", "1000")
+    )
+    self.max_events_per_session = max_events_per_session or int(
+        os.environ.get("SOCIAL_SESSION_MAX_EVENTS", "200")
+    )
+    self._lru: OrderedDict[tuple[str, str, str], None] = OrderedDict()
+    self._lru_lock = threading.Lock()
+
+  def _touch(self, app_name: str, user_id: str, session_id: str) -> None:
+    """Marks a session as recently used and evicts the oldest ones."""
+    evicted = []
+    with self._lru_lock:
+      key = (app_name, user_id, session_id)
+      self._lru[key] = None
+      self._lru.move_to_end(key)
+      while len(self._lru) > self.max_sessions:
+        evicted.append(self._lru.popitem(last=False)[0])
+    for app, user, sid in evicted:
+      self.sessions.get(app, {}).get(user, {}).pop(sid, None)
+
+  def create_session(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    session = super().create_session(
+        app_name=app_name, user_id=user_id, state=state, session_id=session_id
+    )
+    self._touch(app_name, user_id, session.id)
+    return session
+
+  def get_session(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+  ) -> Session:
+    session = super().get_session(
+        app_name=app_name, user_id=user_id, session_id=session_id, config=config
+    )
+    if session is not None:
+      self._touch(app_name, user_id, session_id)
+    return session
+
+  def delete_session(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    super().delete_session(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+    with self._lru_lock:
+      self._lru.pop((app_name, user_id, session_id), None)
+
+  def append_event(self, session: Session, event: Event) -> Event:
+    event = super().append_event(session=session, event=event)
+    stored = (
+        self.sessions.get(session.app_name, {})
+        .get(session.user_id, {})
+        .get(session.id)
+    )
+    if stored is not None and len(stored.events) > self.max_events_per_session:
+      events = stored.events[-self.max_events_per_session:]
+      # Start on a user turn so no function response is left without its call.
+      start = next((i for i, e in enumerate(events) if e.author == "user"), None)
+      if start is None:
+        # No user turn in the window: drop leading function responses instead.
+        start = next(
+            (i for i, e in enumerate(events) if not e.get_function_responses()),
+            len(events),
+        )
+      stored.events = events[start:]
+    return event
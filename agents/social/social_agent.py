@@ -1,13 +1,9 @@
-from typing import Any, AsyncIterable, Dict, Optional
-from google.adk.agents import LoopAgent
-from google.adk.tools.tool_context import ToolContext
-from google.adk.artifacts import InMemoryArtifactService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+import functools
+from typing import TYPE_CHECKING
 from common.task_manager import AgentWithTaskManager
-from social import agent
+
+if TYPE_CHECKING:
+  from google.adk.agents import LoopAgent
 
 class SocialAgent(AgentWithTaskManager):
   """An agent that handles social profile analysis."""
@@ -15,19 +11,38 @@ class SocialAgent(AgentWithTaskManager):
   SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
   def __init__(self):
+    from google.adk.runners import Runner
+
     self._agent = self._build_agent()
     self._user_id = "remote_agent"
+    artifact_service, session_service, memory_service = self._services()
     self._runner = Runner(
         app_name=self._agent.name,
         agent=self._agent,
-        artifact_service=InMemoryArtifactService(),
-        session_service=InMemorySessionService(),
-        memory_service=InMemoryMemoryService(),
+        artifact_service=artifact_service,
+        session_service=session_service,
+        memory_service=memory_service,
+    )
+
+  @classmethod
+  @functools.cache
+  def _services(cls):
+    """Returns the in-memory services shared by every SocialAgent instance."""
+    from google.adk.artifacts import InMemoryArtifactService
+    from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+    from social.session_service import BoundedSessionService
+
+    return (
+        InMemoryArtifactService(),
+        BoundedSessionService(),
+        InMemoryMemoryService(),
     )
 
   def get_processing_message(self) -> str:
       return "Processing the social profile analysis request..."
 
-  def _build_agent(self) -> LoopAgent:
+  def _build_agent(self) -> "LoopAgent":
     """Builds the LLM agent for the social profile analysis agent."""
-    return agent.root_agent
\ No newline at end of file
+    from social import agent
+
+    return agent.root_agent
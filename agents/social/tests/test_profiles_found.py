@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from social import agent, instavibe
+
+
+@pytest.fixture
+def spanner(monkeypatch):
+    """Replaces the Spanner lookups with an in-memory directory of people."""
+    people = {"Alice": "p-alice"}
+    monkeypatch.setattr(instavibe, "get_people_ids_by_names",
+                        lambda names: {n: people[n] for n in names if n in people})
+    for fetch in ("get_posts_for_people", "get_friends_for_people", "get_events_for_people"):
+        monkeypatch.setattr(instavibe, fetch, lambda ids: {i: [] for i in ids})
+
+
+def _context(state, invocation_id="inv-1"):
+    return SimpleNamespace(state=state, invocation_id=invocation_id)
+
+
+def test_later_empty_call_keeps_earlier_hits(spanner):
+    state = {}
+    asyncio.run(instavibe.get_person_profiles(["Alice"], tool_context=_context(state)))
+    asyncio.run(instavibe.get_person_profiles(["Zed"], tool_context=_context(state)))
+
+    assert state["profiles_found"] == ["inv-1", 1]
+    assert agent.skip_summary_without_profiles(_context(state)) is None
+
+
+def test_individual_lookup_after_empty_batch_runs_summary(spanner):
+    state = {}
+    context = _context(state)
+    asyncio.run(instavibe.get_person_profiles(["Zed"], tool_context=context))
+    assert agent.skip_summary_without_profiles(_context(dict(state))) is not None
+
+    tool = SimpleNamespace(name="get_person_id_by_name")
+    agent.count_individual_lookups(tool, {"name": "Alice"}, context, "p-alice")
+
+    assert state["profiles_found"] == ["inv-1", 1]
+    assert agent.skip_summary_without_profiles(_context(state)) is None
+
+
+def test_count_from_earlier_invocation_is_replaced(spanner):
+    state = {"profiles_found": ["inv-0", 3]}
+    asyncio.run(instavibe.get_person_profiles(["Zed"], tool_context=_context(state)))
+
+    assert state["profiles_found"] == ["inv-1", 0]
+    assert agent.skip_summary_without_profiles(_context(state)) is not None
@@ -3,9 +3,16 @@ from dotenv import load_dotenv
 import pprint
 import json 
 import os
+import re
 
 load_dotenv()
 
+# A json-tagged fence (``` or ~~~, tag in any case) opening a line of the response; captures
+# everything up to the last closing fence, or to the end if the fence was never closed.
+_JSON_FENCE_RE = re.compile(r"^[ \t]*(```|~~~)json(?=\s)(.*?)(?:\1(?!.*\1)|\Z)", re.DOTALL | re.IGNORECASE | re.MULTILINE)
+# Any other fence, only when it wraps the whole response; its tag line is dropped.
+_BARE_FENCE_RE = re.compile(r"\s*(```|~~~)[^\n]*\n(.*?)\1\s*", re.DOTALL)
+
 #REPLACE ME initiate agent_engine
 
 
@@ -95,17 +102,11 @@ def call_agent_for_plan(user_name, planned_date, location_n_perference, selected
     yield {"type": "thought", "data": f"--- End of Agent Response Stream ---"}
 
     # Attempt to extract JSON if it's wrapped in markdown
-    if "```json" in accumulated_json_str:
+    fence_match = _JSON_FENCE_RE.search(accumulated_json_str) or _BARE_FENCE_RE.fullmatch(accumulated_json_str)
+    if fence_match:
         print("Detected JSON in markdown code block. Extracting...") 
-       
-        try:
-            # Extract content between ```json and ```
-            json_block = accumulated_json_str.split("```json", 1)[1].rsplit("```", 1)[0].strip()
-            accumulated_json_str = json_block
-            print(f"Extracted JSON block: {accumulated_json_str}") 
-        except IndexError:
-            # print("Error extracting JSON from markdown block. Will try to parse as is.") # Console
-            yield {"type": "thought", "data": "Could not extract JSON from markdown block, will attempt to parse the full response."}
+        accumulated_json_str = fence_match.group(2).strip()
+        print(f"Extracted JSON block: {accumulated_json_str}") 
 
     if accumulated_json_str:
         try: